@@ -5,7 +5,10 @@ class BotTokenException(Exception):
 
 class APIError(Exception):
     """Ошибка, связанная с запросом к API."""
-    pass
+
+    def __init__(self, message, status_code=None):
+        super().__init__(message)
+        self.status_code = status_code
 
 
 class InvalidAPIResponseError(Exception):
@@ -1,11 +1,20 @@
 import logging
 import os
+import signal
 import time
 from http import HTTPStatus
+from logging.handlers import MemoryHandler, RotatingFileHandler
 
 import requests
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
 from telebot import TeleBot
+from urllib3.util.retry import Retry
+
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
 
 from exceptions import (BotTokenException, APIError, InvalidAPIResponseError,
                         UnknownHomeworkStatusError)
@@ -18,8 +27,32 @@ TELEGRAM_TOKEN = os.getenv('TELEGRAM_TOKEN')
 TELEGRAM_CHAT_ID = os.getenv('TELEGRAM_CHAT_ID')
 
 RETRY_PERIOD = 600
+IDLE_RETRY_PERIOD = 1800
+IDLE_CYCLES_LIMIT = 6
+MAX_RETRY_PERIOD = 3600
 ENDPOINT = 'https://practicum.yandex.ru/api/user_api/homework_statuses/'
 HEADERS = {'Authorization': f'OAuth {PRACTICUM_TOKEN}'}
+API_TIMEOUT = (5, 30)
+
+SESSION = requests.Session()
+SESSION.trust_env = False
+SESSION.mount('https://', HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=2,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=1,
+        status_forcelist=(
+            HTTPStatus.TOO_MANY_REQUESTS,
+            HTTPStatus.INTERNAL_SERVER_ERROR,
+            HTTPStatus.BAD_GATEWAY,
+            HTTPStatus.SERVICE_UNAVAILABLE,
+            HTTPStatus.GATEWAY_TIMEOUT
+        ),
+        allowed_methods={'GET'},
+        respect_retry_after_header=True
+    )
+))
 
 
 HOMEWORK_VERDICTS = {
@@ -27,95 +60,108 @@ HOMEWORK_VERDICTS = {
     'reviewing': 'Работа взята на проверку ревьюером.',
     'rejected': 'Работа проверена: у ревьюера есть замечания.'
 }
+HOMEWORK_MESSAGES = {
+    status: 'Изменился статус проверки работы "%s". ' + verdict
+    for status, verdict in HOMEWORK_VERDICTS.items()
+}
 
 
-logging.basicConfig(
-    level=logging.DEBUG,
-    format='%(asctime)s, %(levelname)s, %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler('bot.log', mode='w')
-    ]
-)
+LOG_FORMAT = '%(asctime)s, %(levelname)s, %(message)s'
+LOG_BUFFER_CAPACITY = 64
+
+logger = logging.getLogger(__name__)
 
 
 def check_tokens():
     """Проверяет доступность переменных окружения."""
-    tokens = {
-        'PRACTICUM_TOKEN': PRACTICUM_TOKEN,
-        'TELEGRAM_TOKEN': TELEGRAM_TOKEN,
-        'TELEGRAM_CHAT_ID': TELEGRAM_CHAT_ID
-    }
-    missing_tokens = [name for name, value in tokens.items() if not value]
+    tokens = (
+        ('PRACTICUM_TOKEN', PRACTICUM_TOKEN),
+        ('TELEGRAM_TOKEN', TELEGRAM_TOKEN),
+        ('TELEGRAM_CHAT_ID', TELEGRAM_CHAT_ID)
+    )
+    missing_tokens = [name for name, value in tokens if not value]
     if missing_tokens:
-        logging.critical(f"Не все переменные окружения доступны: "
-                         f"{', '.join(missing_tokens)}"
-                         )
+        logger.critical('Не все переменные окружения доступны: %s',
+                        ', '.join(missing_tokens))
         raise BotTokenException('Не все переменные окружения доступны.')
 
 
 def send_message(bot, message):
-    """Отправляет сообщение в Telegram-чат."""
+    """Отправляет сообщение в Telegram-чат, возвращает успех отправки."""
     try:
-        logging.debug(f'Отправка сообщения в чат {message}')
+        logger.debug('Отправка сообщения в чат %s', message)
         bot.send_message(TELEGRAM_CHAT_ID, message)
-        logging.debug(f'Сообщение отправлено в чат {message}')
+        logger.debug('Сообщение отправлено в чат %s', message)
+        return True
     except Exception as error:
-        logging.error(f'Ошибка при отправке сообщения: {error}')
+        logger.error('Ошибка при отправке сообщения: %s', error)
+        return False
+
+
+def _auth_headers():
+    """Формирует заголовок авторизации из текущего PRACTICUM_TOKEN."""
+    return {'Authorization': f'OAuth {PRACTICUM_TOKEN}'}
 
 
 def get_api_answer(timestamp):
     """Делает запрос к API и возвращает ответ в виде Python-объекта."""
     params = {'from_date': timestamp}
     try:
-        response = requests.get(ENDPOINT, headers=HEADERS, params=params)
+        response = SESSION.get(
+            ENDPOINT,
+            headers=_auth_headers(),
+            params=params,
+            timeout=API_TIMEOUT
+        )
         if response.status_code != HTTPStatus.OK:
             raise APIError(
                 f'Эндпоинт {ENDPOINT} недоступен. '
-                f'Код ответа: {response.status_code}'
+                f'Код ответа: {response.status_code}',
+                status_code=response.status_code
             )
-        return response.json()
+        return json_loads(response.content)
     except requests.RequestException as req_err:
-        raise APIError(f'Ошибка при запросе к API: {req_err}')
+        raise APIError(f'Ошибка при запросе к API: {req_err}') from req_err
+    except ValueError as json_err:
+        raise APIError(
+            f'Ответ API не является корректным JSON: {json_err}'
+        ) from json_err
 
 
 def check_response(response):
     """Проверяет корректность ответа API."""
-    if not isinstance(response, dict):
+    try:
+        homeworks = response['homeworks']
+        response['current_date']
+    except KeyError as error:
+        raise KeyError(f'Поле {error} отсутствует') from error
+    except TypeError as error:
         raise TypeError(f'Ответ API должен быть словарём, '
                         f'получен {type(response)}'
-                        )
-    if 'homeworks' not in response:
-        raise KeyError('Поле "homeworks" отсутствует')
-    if 'current_date' not in response:
-        raise KeyError('Поле "current_date" отсутствует')
-    homeworks = response['homeworks']
-    if not isinstance(homeworks, list):
+                        ) from error
+    if type(homeworks) is not list:
         raise TypeError(f'Поле "homeworks" должно быть списком, '
                         f'получен {type(homeworks)}'
                         )
-    logging.debug('Ответ API прошёл проверку')
+    logger.debug('Ответ API прошёл проверку')
     return homeworks
 
 
 def parse_status(homework):
     """Извлекает статус домашней работы."""
-    if 'homework_name' not in homework:
-        raise InvalidAPIResponseError('Поле "homework_name" отсутствует')
-    if 'status' not in homework:
-        raise InvalidAPIResponseError('Поле "status" отсутствует')
-
-    homework_name = homework['homework_name']
-    homework_status = homework['status']
+    try:
+        homework_name = homework['homework_name']
+        homework_status = homework['status']
+    except KeyError as error:
+        raise InvalidAPIResponseError(f'Поле {error} отсутствует') from error
 
     if homework_status not in HOMEWORK_VERDICTS:
         raise UnknownHomeworkStatusError(
             f'Неизвестный статус работы: {homework_status}'
         )
 
-    verdict = HOMEWORK_VERDICTS[homework_status]
-    logging.info(f'Сформировано сообщение о статусе: {homework_name}')
-    return f'Изменился статус проверки работы "{homework_name}". {verdict}'
+    logger.info('Сформировано сообщение о статусе: %s', homework_name)
+    return HOMEWORK_MESSAGES[homework_status] % homework_name
 
 
 def main():
@@ -124,6 +170,10 @@ def main():
 
     bot = TeleBot(token=TELEGRAM_TOKEN)
     timestamp = int(time.time())
+    idle_cycles = 0
+    retry_period = RETRY_PERIOD
+    last_error_key = None
+    next_poll = time.monotonic()
 
     while True:
         try:
@@ -131,20 +181,58 @@ def main():
             homeworks = check_response(response)
 
             if homeworks:
+                idle_cycles = 0
                 message = parse_status(homeworks[0])
                 send_message(bot, message)
             else:
-                logging.debug('Нет новых статусов домашних работ')
+                idle_cycles += 1
+                logger.debug('Нет новых статусов домашних работ')
+
+            if idle_cycles < IDLE_CYCLES_LIMIT:
+                retry_period = RETRY_PERIOD
+            else:
+                retry_period = IDLE_RETRY_PERIOD
 
-            timestamp = response.get('current_date', timestamp)
+            timestamp = response['current_date']
+            last_error_key = None
 
         except Exception as error:
             message = f'Сбой в работе программы: {error}'
-            logging.error(message)
-            send_message(bot, message)
-        finally:
-            time.sleep(RETRY_PERIOD)
+            logger.exception(message)
+            error_key = (
+                type(error.__cause__ or error).__name__,
+                getattr(error, 'status_code', None)
+            )
+            if (error_key != last_error_key
+                    and send_message(bot, message)):
+                last_error_key = error_key
+            retry_period = min(retry_period * 2, MAX_RETRY_PERIOD)
+
+        now = time.monotonic()
+        next_poll = max(next_poll + retry_period, now)
+        delay = next_poll - now
+        time.sleep(delay)
 
 
 if __name__ == '__main__':
-    main()
+    file_handler = RotatingFileHandler(
+        'bot.log', maxBytes=5_000_000, backupCount=3, encoding='utf-8'
+    )
+    file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    logging.basicConfig(
+        level=logging.DEBUG,
+        format=LOG_FORMAT,
+        handlers=[
+            logging.StreamHandler(),
+            MemoryHandler(
+                LOG_BUFFER_CAPACITY,
+                flushLevel=logging.ERROR,
+                target=file_handler
+            )
+        ]
+    )
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    try:
+        main()
+    except KeyboardInterrupt:
+        logger.info('Бот остановлен')
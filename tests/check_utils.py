@@ -1,3 +1,4 @@
+import json
 import logging
 import signal
 import re
@@ -101,6 +102,10 @@ class MockResponseGET:
     def json(self):
         return self.data
 
+    @property
+    def content(self):
+        return json.dumps(self.data).encode()
+
     def raise_for_status(self):
         if self.status_code >= 400:
             raise ValueError('Server or client error.')